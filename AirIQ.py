@@ -23,16 +23,21 @@ Author: AirIQ Project
 Version: 1.0
 """
 
+import sys
 import time
+import struct
 import serial
 import json
 import csv
 from datetime import datetime
 import threading
 import logging
-from pathlib import Path
+import operator
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import RPi.GPIO as GPIO
-from typing import Dict, Optional, Tuple
+from typing import Dict, NamedTuple, Optional, Tuple
 import adafruit_dht
 import board
 import digitalio
@@ -52,15 +57,66 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Big-endian frame layouts for the UART sensors
+_PMS_FMT = struct.Struct('>HHH')     # PM1.0, PM2.5, PM10 (atmospheric)
+_PMS_CHECKSUM = struct.Struct('>H')  # trailing checksum word
+_MHZ_FMT = struct.Struct('>HH')      # CO2 high/low, temperature + status
+
+
+def _detect_raspberry_pi() -> Optional[bool]:
+    """Scan /proc/cpuinfo line by line, None if it can't be read"""
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            return any('Raspberry Pi' in line for line in f)
+    except FileNotFoundError:
+        return None
+
+
+# Evaluated once at import
+IS_RASPBERRY_PI = _detect_raspberry_pi()
+
+
+class PMSReading(NamedTuple):
+    """PMS5003 reading (μg/m³)"""
+    pm1_0: int
+    pm2_5: int
+    pm10: int
+
+
+class MHZReading(NamedTuple):
+    """MH-Z19 reading (ppm, °C)"""
+    co2: int
+    temperature: int
+
+
+class SGPReading(NamedTuple):
+    """SGP30 reading (ppm, ppb)"""
+    eco2: int
+    tvoc: int
+
+
+class MQReading(NamedTuple):
+    """MQ131 reading (ppb, V)"""
+    ozone: float
+    voltage: float
+
+
+class DHTReading(NamedTuple):
+    """DHT22 reading (°C, %)"""
+    temperature: float
+    humidity: float
+
 
 class SensorBase:
     """Base class for all sensors"""
+    VALUE_KEYS: Tuple[str, ...] = ()  # field names of the reading tuple
+    
     def __init__(self, name: str):
         self.name = name
         self.last_reading = None
         self.last_update = None
     
-    def read(self) -> Optional[Dict]:
+    def read(self) -> Optional[NamedTuple]:
         """Read sensor data - to be implemented by subclasses"""
         raise NotImplementedError
     
@@ -71,39 +127,84 @@ class SensorBase:
 
 class PMS5003Sensor(SensorBase):
     """PM2.5 Particulate Matter Sensor"""
+    VALUE_KEYS = PMSReading._fields
+    FRAME_HEADER = b'\x42\x4d'
+    FRAME_LEN = 32
+    FRAME_LEN_WORD = b'\x00\x1c'  # bytes 2-3: 28 bytes follow in a data frame
+    CMD_PASSIVE_MODE = b'\x42\x4d\xe1\x00\x00\x01\x70'
+    CMD_READ = b'\x42\x4d\xe2\x00\x00\x01\x71'
+    READ_DEADLINE = 0.2  # seconds to wait for a full frame
+
     def __init__(self, uart_port='/dev/ttyUSB0', baudrate=9600):
         super().__init__("PMS5003")
+        self._buf = bytearray()
         try:
-            self.serial = serial.Serial(uart_port, baudrate, timeout=1)
+            self.serial = serial.Serial(uart_port, baudrate, timeout=0.2)
+            # Passive mode: the sensor only answers when asked
+            self.serial.write(self.CMD_PASSIVE_MODE)
             logger.info(f"PMS5003 initialized on {uart_port}")
         except Exception as e:
             logger.error(f"Failed to initialize PMS5003: {e}")
             self.serial = None
     
-    def read(self) -> Optional[Dict]:
+    def _next_frame(self) -> Optional[bytes]:
+        """Pop the next complete data frame from the receive buffer"""
+        while True:
+            header = self._buf.find(self.FRAME_HEADER)
+            if header < 0:
+                # Keep a trailing 0x42 in case it starts the next header
+                del self._buf[:max(0, len(self._buf) - 1)]
+                return None
+            if len(self._buf) < header + 4:
+                return None
+            if self._buf[header + 2:header + 4] != self.FRAME_LEN_WORD:
+                # Not a data frame (e.g. the 8-byte mode ack): skip its header only
+                del self._buf[:header + 2]
+                continue
+            if len(self._buf) < header + self.FRAME_LEN:
+                return None
+            
+            frame = bytes(self._buf[header:header + self.FRAME_LEN])
+            del self._buf[:header + self.FRAME_LEN]
+            return frame
+    
+    def read(self) -> Optional[PMSReading]:
         """Read PM1.0, PM2.5, PM10 values"""
         if not self.serial:
             return None
         
         try:
+            # Drop stale frames (active-mode output, late replies) so the
+            # frame parsed below is the answer to this request
+            self._buf.clear()
+            self.serial.reset_input_buffer()
+            
             # Send read command
-            self.serial.write(b'\x42\x4d\xe2\x00\x00\x01\x71')
-            time.sleep(0.1)
+            self.serial.write(self.CMD_READ)
             
-            # Read response
-            data = self.serial.read(32)
-            if len(data) == 32 and data[0] == 0x42 and data[1] == 0x4d:
-                # Parse data
-                pm1_0 = (data[10] << 8) | data[11]
-                pm2_5 = (data[12] << 8) | data[13]
-                pm10 = (data[14] << 8) | data[15]
+            # Drain whatever has arrived until a full frame is buffered;
+            # read() blocks only until the missing bytes show up
+            deadline = time.monotonic() + self.READ_DEADLINE
+            frame = self._next_frame()
+            while frame is None and time.monotonic() < deadline:
+                wanted = max(self.serial.in_waiting,
+                             self.FRAME_LEN - len(self._buf), 1)
+                chunk = self.serial.read(wanted)
+                if not chunk:
+                    break
+                self._buf += chunk
+                frame = self._next_frame()
+            
+            if frame:
+                (checksum,) = _PMS_CHECKSUM.unpack_from(frame, 30)
+                if sum(frame[:-2]) & 0xFFFF != checksum:
+                    logger.warning("PMS5003 checksum mismatch")
+                    return None
+                
+                # Atmospheric environment values
+                pm1_0, pm2_5, pm10 = _PMS_FMT.unpack_from(frame, 10)
                 
-                self.last_reading = {
-                    'pm1_0': pm1_0,
-                    'pm2_5': pm2_5,
-                    'pm10': pm10,
-                    'unit': 'μg/m³'
-                }
+                self.last_reading = PMSReading(pm1_0, pm2_5, pm10)
                 self.last_update = datetime.now()
                 return self.last_reading
         except Exception as e:
@@ -114,38 +215,44 @@ class PMS5003Sensor(SensorBase):
 
 class MHZ19Sensor(SensorBase):
     """CO2 Sensor"""
+    VALUE_KEYS = MHZReading._fields
+    CMD_READ = b'\xff\x01\x86\x00\x00\x00\x00\x00\x79'
+    
+    @staticmethod
+    def _checksum(frame: bytes) -> int:
+        """MH-Z19 checksum: two's complement of the sum of bytes 1-7"""
+        return (0xFF - (sum(frame[1:8]) & 0xFF) + 1) & 0xFF
+    
     def __init__(self, uart_port='/dev/ttyUSB1', baudrate=9600):
         super().__init__("MH-Z19")
         try:
-            self.serial = serial.Serial(uart_port, baudrate, timeout=1)
+            self.serial = serial.Serial(uart_port, baudrate, timeout=0.2)
             logger.info(f"MH-Z19 initialized on {uart_port}")
         except Exception as e:
             logger.error(f"Failed to initialize MH-Z19: {e}")
             self.serial = None
     
-    def read(self) -> Optional[Dict]:
+    def read(self) -> Optional[MHZReading]:
         """Read CO2 concentration"""
         if not self.serial:
             return None
         
         try:
             # Send read command
-            cmd = b'\xff\x01\x86\x00\x00\x00\x00\x00\x79'
-            self.serial.write(cmd)
-            time.sleep(0.1)
+            self.serial.reset_input_buffer()  # Drop stale frames
+            self.serial.write(self.CMD_READ)
             
-            # Read response
+            # Read response (blocks until 9 bytes arrive or timeout)
             response = self.serial.read(9)
             if len(response) == 9 and response[0] == 0xff and response[1] == 0x86:
-                co2 = (response[2] << 8) | response[3]
-                temp = response[4] - 40  # Temperature offset
+                if self._checksum(response) != response[8]:
+                    logger.warning("MH-Z19 checksum mismatch")
+                    return None
                 
-                self.last_reading = {
-                    'co2': co2,
-                    'temperature': temp,
-                    'unit_co2': 'ppm',
-                    'unit_temp': '°C'
-                }
+                co2, raw_temp = _MHZ_FMT.unpack_from(response, 2)
+                temp = (raw_temp >> 8) - 40  # Temperature offset
+                
+                self.last_reading = MHZReading(co2, temp)
                 self.last_update = datetime.now()
                 return self.last_reading
         except Exception as e:
@@ -156,10 +263,13 @@ class MHZ19Sensor(SensorBase):
 
 class SGP30Sensor(SensorBase):
     """VOC and eCO2 Sensor"""
-    def __init__(self):
+    VALUE_KEYS = SGPReading._fields
+    
+    def __init__(self, i2c=None):
         super().__init__("SGP30")
         try:
-            i2c = busio.I2C(board.SCL, board.SDA, frequency=100000)
+            if i2c is None:
+                i2c = busio.I2C(board.SCL, board.SDA, frequency=100000)
             self.sgp30 = adafruit_sgp30.Adafruit_SGP30(i2c)
             
             # Initialize baseline
@@ -170,7 +280,7 @@ class SGP30Sensor(SensorBase):
             logger.error(f"Failed to initialize SGP30: {e}")
             self.sgp30 = None
     
-    def read(self) -> Optional[Dict]:
+    def read(self) -> Optional[SGPReading]:
         """Read VOC and eCO2 values"""
         if not self.sgp30:
             return None
@@ -178,12 +288,7 @@ class SGP30Sensor(SensorBase):
         try:
             eco2, tvoc = self.sgp30.iaq_measure()
             
-            self.last_reading = {
-                'eco2': eco2,
-                'tvoc': tvoc,
-                'unit_eco2': 'ppm',
-                'unit_tvoc': 'ppb'
-            }
+            self.last_reading = SGPReading(eco2, tvoc)
             self.last_update = datetime.now()
             return self.last_reading
         except Exception as e:
@@ -194,6 +299,8 @@ class SGP30Sensor(SensorBase):
 
 class MQ131Sensor(SensorBase):
     """Ozone Sensor (Analog)"""
+    VALUE_KEYS = MQReading._fields
+    
     def __init__(self, adc_channel=0):
         super().__init__("MQ131")
         self.adc_channel = adc_channel
@@ -217,7 +324,7 @@ class MQ131Sensor(SensorBase):
         data = ((adc[1] & 3) << 8) + adc[2]
         return data
     
-    def read(self) -> Optional[Dict]:
+    def read(self) -> Optional[MQReading]:
         """Read ozone concentration"""
         if not self.spi:
             return None
@@ -231,11 +338,7 @@ class MQ131Sensor(SensorBase):
             ozone_ppb = (voltage - 0.4) * 1000 / 2.0
             ozone_ppb = max(0, ozone_ppb)  # Ensure non-negative
             
-            self.last_reading = {
-                'ozone': round(ozone_ppb, 2),
-                'voltage': round(voltage, 3),
-                'unit': 'ppb'
-            }
+            self.last_reading = MQReading(round(ozone_ppb, 2), round(voltage, 3))
             self.last_update = datetime.now()
             return self.last_reading
         except Exception as e:
@@ -246,16 +349,19 @@ class MQ131Sensor(SensorBase):
 
 class DHT22Sensor(SensorBase):
     """Temperature and Humidity Sensor"""
+    VALUE_KEYS = DHTReading._fields
+    
     def __init__(self, pin=board.D4):
         super().__init__("DHT22")
         try:
-            self.dht = adafruit_dht.DHT22(pin)
+            # pulseio captures the pulse train in C instead of Python GPIO polling
+            self.dht = adafruit_dht.DHT22(pin, use_pulseio=True)
             logger.info("DHT22 initialized")
         except Exception as e:
             logger.error(f"Failed to initialize DHT22: {e}")
             self.dht = None
     
-    def read(self) -> Optional[Dict]:
+    def read(self) -> Optional[DHTReading]:
         """Read temperature and humidity"""
         if not self.dht:
             return None
@@ -265,12 +371,8 @@ class DHT22Sensor(SensorBase):
             humidity = self.dht.humidity
             
             if temperature is not None and humidity is not None:
-                self.last_reading = {
-                    'temperature': round(temperature, 1),
-                    'humidity': round(humidity, 1),
-                    'unit_temp': '°C',
-                    'unit_hum': '%'
-                }
+                self.last_reading = DHTReading(round(temperature, 1),
+                                               round(humidity, 1))
                 self.last_update = datetime.now()
                 return self.last_reading
         except Exception as e:
@@ -281,19 +383,65 @@ class DHT22Sensor(SensorBase):
 
 class AirQualityMonitor:
     """Main Air Quality Monitor class"""
+    SENSOR_READ_TIMEOUT = 2.0  # seconds to wait for any single sensor
+    OUTPUT_RING_SIZE = 128     # cycles buffered ahead of the logger/display
+    
+    # Reading keys in CSV column order
+    _CSV_KEYS = ('timestamp', 'pms5003_pm1_0', 'pms5003_pm2_5', 'pms5003_pm10',
+                 'mhz19_co2', 'sgp30_eco2', 'sgp30_tvoc', 'mq131_ozone',
+                 'dht22_temperature', 'dht22_humidity')
+    _CSV_GET = operator.itemgetter(*_CSV_KEYS)
+    
     def __init__(self, config_file='config.json'):
         self.config = self._load_config(config_file)
         self.sensors = {}
         self.display = None
         self.running = False
         
+        # SGP30 and the OLED share one I2C bus; both handle 400 kHz
+        self._i2c = None
+        if (self.config['sensors']['sgp30']['enabled'] or
+                self.config['display']['type'] == 'oled'):
+            try:
+                self._i2c = busio.I2C(board.SCL, board.SDA, frequency=400_000)
+            except Exception as e:
+                logger.error(f"Failed to initialize I2C bus: {e}")
+        
         # Initialize sensors
         self._init_sensors()
         self._init_display()
         
+        # Flattened data keys per sensor, e.g. 'pms5003_pm2_5'
+        self._flat_keys = {
+            name: tuple(f"{name}_{key}" for key in sensor.VALUE_KEYS)
+            for name, sensor in self.sensors.items()
+        }
+        
+        # One worker per sensor so blocking reads overlap; a sensor is never
+        # read again while its last read is still running, so a stuck read
+        # can't share its port with a new one or starve the other sensors
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.sensors)),
+                                        thread_name_prefix='sensor')
+        self._reads: Dict[str, Future] = {}
+        
+        # Readings are handed to the logger/display thread through a bounded
+        # ring; a stalled consumer drops the oldest cycles, never blocks reads
+        self._ring = deque(maxlen=self.OUTPUT_RING_SIZE)
+        self._ring_ready = threading.Event()
+        self._output_thread = None
+        
         # Data storage
         self.data_file = 'air_quality_data.csv'
         self._init_csv_file()
+        
+        # Keep the CSV open and flush in batches instead of reopening per row;
+        # the time bound keeps slow cadences from holding rows back
+        self._flush_rows = self.config['logging'].get('flush_rows', 5)
+        self._flush_seconds = self.config['logging'].get('flush_seconds', 10)
+        self._rows_pending = 0
+        self._last_flush = time.monotonic()
+        self._csv_fh = open(self.data_file, 'a', newline='', buffering=1 << 16)
+        self._csv_writer = csv.writer(self._csv_fh)
     
     def _load_config(self, config_file: str) -> Dict:
         """Load configuration from JSON file"""
@@ -306,7 +454,8 @@ class AirQualityMonitor:
                 "dht22": {"enabled": True, "pin": 4}
             },
             "display": {"enabled": True, "type": "console"},
-            "logging": {"interval": 60, "enabled": True},
+            "logging": {"interval": 60, "enabled": True, "flush_rows": 5,
+                        "flush_seconds": 10},
             "alerts": {
                 "pm2_5_threshold": 35,
                 "co2_threshold": 1000,
@@ -337,7 +486,7 @@ class AirQualityMonitor:
             self.sensors['mhz19'] = MHZ19Sensor(config['mhz19']['port'])
         
         if config['sgp30']['enabled']:
-            self.sensors['sgp30'] = SGP30Sensor()
+            self.sensors['sgp30'] = SGP30Sensor(i2c=self._i2c)
         
         if config['mq131']['enabled']:
             self.sensors['mq131'] = MQ131Sensor(config['mq131']['channel'])
@@ -356,63 +505,96 @@ class AirQualityMonitor:
         display_type = self.config['display']['type']
         if display_type == 'oled':
             try:
-                i2c = busio.I2C(board.SCL, board.SDA)
+                i2c = self._i2c or busio.I2C(board.SCL, board.SDA)
                 self.display = adafruit_ssd1306.SSD1306_I2C(128, 64, i2c)
                 self.display.fill(0)
                 self.display.show()
+                
+                # Reuse one frame buffer and font for every refresh
+                try:
+                    self._font = ImageFont.truetype('DejaVuSans.ttf', 10)
+                except OSError:
+                    self._font = ImageFont.load_default()
+                self._image = Image.new('1', (128, 64))
+                self._draw = ImageDraw.Draw(self._image)
                 logger.info("OLED display initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize OLED: {e}")
     
     def _init_csv_file(self):
         """Initialize CSV file with headers"""
-        if not Path(self.data_file).exists():
-            headers = ['timestamp', 'pm1_0', 'pm2_5', 'pm10', 'co2', 'eco2', 
-                      'tvoc', 'ozone', 'temperature', 'humidity']
-            with open(self.data_file, 'w', newline='') as f:
+        headers = ['timestamp', 'pm1_0', 'pm2_5', 'pm10', 'co2', 'eco2', 
+                  'tvoc', 'ozone', 'temperature', 'humidity']
+        try:
+            # Exclusive create: atomic, no separate exists() check
+            with open(self.data_file, 'x', newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow(headers)
+        except FileExistsError:
+            pass
     
     def read_all_sensors(self) -> Dict:
         """Read data from all sensors"""
-        data = {'timestamp': datetime.now().isoformat()}
-        
-        for sensor_name, sensor in self.sensors.items():
+        data = {'timestamp_ns': time.time_ns()}
+        
+        futures = {}
+        for name, sensor in self.sensors.items():
+            previous = self._reads.get(name)
+            if previous is not None and not previous.done():
+                logger.warning(f"Skipping {name}: previous read still running")
+                continue
+            futures[name] = self._reads[name] = self._pool.submit(sensor.read)
+        
+        # One deadline for the whole cycle, not one timeout per sensor
+        deadline = time.monotonic() + self.SENSOR_READ_TIMEOUT
+        for sensor_name, future in futures.items():
             try:
-                reading = sensor.read()
+                reading = future.result(timeout=max(0, deadline - time.monotonic()))
                 if reading:
                     # Flatten the reading data
-                    for key, value in reading.items():
-                        if not key.startswith('unit'):
-                            data[f"{sensor_name}_{key}"] = value
+                    for key, value in zip(self._flat_keys[sensor_name], reading):
+                        if value is not None:
+                            data[key] = value
                 else:
                     logger.warning(f"No reading from {sensor_name}")
+            except FutureTimeoutError:
+                logger.error(f"Timed out reading {sensor_name} "
+                             f"after {self.SENSOR_READ_TIMEOUT}s")
             except Exception as e:
                 logger.error(f"Error reading {sensor_name}: {e}")
         
         return data
     
+    def _timestamp_str(self, data: Dict) -> str:
+        """Format the cycle timestamp on first use and keep it in data"""
+        timestamp = data.get('timestamp')
+        if timestamp is None:
+            timestamp = datetime.fromtimestamp(
+                data['timestamp_ns'] / 1e9).isoformat(timespec='seconds')
+            data['timestamp'] = timestamp
+        return timestamp
+    
     def log_data(self, data: Dict):
         """Log data to CSV file"""
         if not self.config['logging']['enabled']:
             return
         
         try:
-            with open(self.data_file, 'a', newline='') as f:
-                writer = csv.writer(f)
-                row = [
-                    data.get('timestamp', ''),
-                    data.get('pms5003_pm1_0', ''),
-                    data.get('pms5003_pm2_5', ''),
-                    data.get('pms5003_pm10', ''),
-                    data.get('mhz19_co2', ''),
-                    data.get('sgp30_eco2', ''),
-                    data.get('sgp30_tvoc', ''),
-                    data.get('mq131_ozone', ''),
-                    data.get('dht22_temperature', ''),
-                    data.get('dht22_humidity', '')
-                ]
-                writer.writerow(row)
+            self._timestamp_str(data)
+            try:
+                row = self._CSV_GET(data)
+            except KeyError:
+                # Some sensor missed this cycle; leave its columns empty
+                row = [data.get(key, '') for key in self._CSV_KEYS]
+            self._csv_writer.writerow(row)
+            
+            self._rows_pending += 1
+            now = time.monotonic()
+            if (self._rows_pending >= self._flush_rows
+                    or now - self._last_flush >= self._flush_seconds):
+                self._csv_fh.flush()
+                self._rows_pending = 0
+                self._last_flush = now
         except Exception as e:
             logger.error(f"Error logging data: {e}")
     
@@ -451,58 +633,59 @@ class AirQualityMonitor:
     
     def _display_console(self, data: Dict, alerts: list = None):
         """Display data on console"""
-        print("\n" + "="*50)
-        print(f"Air Quality Monitor - {data.get('timestamp', 'Unknown time')}")
-        print("="*50)
+        # Nobody is watching a daemonized run; skip the formatting entirely
+        if not sys.stdout.isatty():
+            return
+        
+        rule = "=" * 50
+        lines = ["", rule, f"Air Quality Monitor - {self._timestamp_str(data)}", rule]
         
         # PM2.5 data
         pm2_5 = data.get('pms5003_pm2_5')
         if pm2_5:
-            print(f"PM2.5: {pm2_5} μg/m³")
+            lines.append(f"PM2.5: {pm2_5} μg/m³")
         
         # CO2 data
         co2 = data.get('mhz19_co2')
         if co2:
-            print(f"CO2: {co2} ppm")
+            lines.append(f"CO2: {co2} ppm")
         
         # VOC data
         tvoc = data.get('sgp30_tvoc')
         if tvoc:
-            print(f"TVOC: {tvoc} ppb")
+            lines.append(f"TVOC: {tvoc} ppb")
         
         # Ozone data
         ozone = data.get('mq131_ozone')
         if ozone:
-            print(f"Ozone: {ozone} ppb")
+            lines.append(f"Ozone: {ozone} ppb")
         
         # Temperature & Humidity
         temp = data.get('dht22_temperature')
         hum = data.get('dht22_humidity')
         if temp and hum:
-            print(f"Temp: {temp}°C, Humidity: {hum}%")
+            lines.append(f"Temp: {temp}°C, Humidity: {hum}%")
         
         # Alerts
         if alerts:
-            print("\n🚨 ALERTS:")
-            for alert in alerts:
-                print(f"  - {alert}")
+            lines.append("\n🚨 ALERTS:")
+            lines.extend(f"  - {alert}" for alert in alerts)
         
-        print("="*50)
+        lines.append(rule)
+        
+        # One write and one flush per frame
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     def _display_oled(self, data: Dict, alerts: list = None):
         """Display data on OLED screen"""
         if not self.display:
             return
         
-        # Create image
-        image = Image.new('1', (128, 64))
-        draw = ImageDraw.Draw(image)
-        
-        # Load font (use default if custom font not available)
-        try:
-            font = ImageFont.truetype('DejaVuSans.ttf', 10)
-        except:
-            font = ImageFont.load_default()
+        # Clear the persistent frame buffer
+        draw = self._draw
+        font = self._font
+        draw.rectangle((0, 0, 128, 64), fill=0)
         
         # Display key measurements
         y = 0
@@ -527,7 +710,7 @@ class AirQualityMonitor:
             draw.text((0, y), "ALERT!", font=font, fill=255)
         
         # Update display
-        self.display.image(image)
+        self.display.image(self._image)
         self.display.show()
     
     def run_monitoring_loop(self):
@@ -535,22 +718,30 @@ class AirQualityMonitor:
         self.running = True
         logger.info("Starting air quality monitoring...")
         
+        interval = self.config['logging']['interval']
+        next_tick = time.monotonic()
+        
+        self._output_thread = threading.Thread(target=self._output_loop,
+                                               name='output', daemon=True)
+        self._output_thread.start()
+        
         try:
             while self.running:
-                # Read all sensors
-                data = self.read_all_sensors()
-                
-                # Log data
-                self.log_data(data)
+                next_tick += interval
                 
-                # Check alerts
-                alerts = self.check_alerts(data)
-                
-                # Display data
-                self.display_data(data, alerts)
+                # Read all sensors and hand the cycle to the output thread
+                data = self.read_all_sensors()
+                self._ring.append(data)
+                self._ring_ready.set()
                 
-                # Wait for next reading
-                time.sleep(self.config['logging']['interval'])
+                # Wait for next reading, measured from the previous tick so
+                # processing time doesn't accumulate as drift
+                remaining = next_tick - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    logger.warning(f"Monitoring loop overran by {-remaining:.2f}s")
+                    next_tick = time.monotonic()
                 
         except KeyboardInterrupt:
             logger.info("Monitoring stopped by user")
@@ -559,10 +750,45 @@ class AirQualityMonitor:
         finally:
             self.cleanup()
     
+    def _output_loop(self):
+        """Log, check alerts and display queued cycles off the read loop"""
+        while self.running or self._ring:
+            self._ring_ready.wait(timeout=1.0)
+            self._ring_ready.clear()
+            
+            while self._ring:
+                data = self._ring.popleft()
+                try:
+                    # Log data
+                    self.log_data(data)
+                    
+                    # Check alerts
+                    alerts = self.check_alerts(data)
+                    
+                    # Display data
+                    self.display_data(data, alerts)
+                except Exception as e:
+                    logger.error(f"Output error: {e}")
+    
     def cleanup(self):
         """Clean up resources"""
         self.running = False
         
+        # Let the output thread drain queued cycles
+        if self._output_thread:
+            self._ring_ready.set()
+            self._output_thread.join()
+            self._output_thread = None
+        
+        # Stop the sensor worker threads; give in-flight reads one timeout
+        # to finish, but don't let a stuck read hold up releasing the ports
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        wait(self._reads.values(), timeout=self.SENSOR_READ_TIMEOUT)
+        
+        # Flush buffered rows and close the data file
+        if not self._csv_fh.closed:
+            self._csv_fh.close()
+        
         # Close serial connections
         for sensor in self.sensors.values():
             if hasattr(sensor, 'serial') and sensor.serial:
@@ -573,6 +799,10 @@ class AirQualityMonitor:
             self.display.fill(0)
             self.display.show()
         
+        # Release the shared I2C bus
+        if self._i2c:
+            self._i2c.deinit()
+        
         logger.info("Cleanup completed")
 
 
@@ -582,14 +812,12 @@ def main():
     print("====================================")
     
     # Check if running on Raspberry Pi
-    try:
-        with open('/proc/cpuinfo', 'r') as f:
-            if 'Raspberry Pi' not in f.read():
-                print("⚠️  Warning: Not running on Raspberry Pi")
-                print("Consider using AirIQ_demo.py for testing on other platforms")
-    except FileNotFoundError:
+    if IS_RASPBERRY_PI is None:
         print("⚠️  Warning: Cannot detect platform")
         print("Consider using AirIQ_demo.py for testing on other platforms")
+    elif not IS_RASPBERRY_PI:
+        print("⚠️  Warning: Not running on Raspberry Pi")
+        print("Consider using AirIQ_demo.py for testing on other platforms")
     
     try:
         # Initialize and run monitor
@@ -4,12 +4,15 @@ AIR QUALITY MONITOR DEMO VERSION
 This version simulates sensor readings for demonstration on Windows
 """
 
+import sys
 import time
 import json
+import struct
 import csv
 import random
+from bisect import bisect_left
+import operator
 from datetime import datetime
-from pathlib import Path
 import logging
 
 # Configure logging (Windows-compatible)
@@ -23,29 +26,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Binary log record: epoch ns timestamp + one float32 per reading
+_BIN_RECORD = struct.Struct('<q7f')
+
+
+def _format_timestamp_ns(timestamp_ns):
+    """Format an epoch-ns timestamp the way it appears in the CSV"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat(timespec='seconds')
+
 
 class DemoSensor:
-    """Demo sensor that generates realistic fake data"""
+    """Demo sensor description; readings are generated by read_all_sensors"""
     def __init__(self, name, base_value, variation, unit):
         self.name = name
         self.base_value = base_value
         self.variation = variation
         self.unit = unit
-        self.last_reading = None
-        self.last_update = None
-    
-    def read(self):
-        """Generate realistic sensor reading"""
-        # Add some random variation
-        value = self.base_value + random.uniform(-self.variation, self.variation)
-        value = max(0, value)  # Ensure non-negative
-        
-        self.last_reading = {
-            'value': round(value, 1),
-            'unit': self.unit
-        }
-        self.last_update = datetime.now()
-        return self.last_reading
     
     def is_healthy(self):
         return True
@@ -54,7 +50,25 @@ class DemoSensor:
 class AirQualityMonitorDemo:
     """Demo version of Air Quality Monitor"""
     
-    def __init__(self):
+    # CSV columns, also the keys of each reading
+    _CSV_KEYS = ('timestamp', 'pm2_5', 'pm10', 'co2', 'tvoc', 'ozone',
+                 'temperature', 'humidity')
+    _CSV_GET = operator.itemgetter(*_CSV_KEYS)
+    _VALUE_GET = operator.itemgetter(*_CSV_KEYS[1:])
+    
+    # EPA PM2.5 breakpoints: (pm_low, aqi_low, aqi_span, pm_span, category, color)
+    _AQI_BANDS = (
+        (0, 0, 50, 12, "Good", "🟢"),
+        (12, 50, 50, 23.4, "Moderate", "🟡"),
+        (35.4, 100, 50, 20, "Unhealthy for Sensitive", "🟠"),
+        (55.4, 150, 50, 95, "Unhealthy", "🔴"),
+        (150.4, 200, 100, 100, "Very Unhealthy", "🟣"),
+        (250.4, 300, 100, 99.6, "Hazardous", "🟤"),
+    )
+    # Inclusive upper PM2.5 bound of every band but the last
+    _AQI_PM_UPPER = (12, 35.4, 55.4, 150.4, 250.4)
+    
+    def __init__(self, binary_log=False):
         self.sensors = {
             'pm2_5': DemoSensor('PM2.5', 15, 10, 'μg/m³'),
             'pm10': DemoSensor('PM10', 25, 15, 'μg/m³'),
@@ -65,17 +79,28 @@ class AirQualityMonitorDemo:
             'humidity': DemoSensor('Humidity', 45, 15, '%')
         }
         
+        # Flat per-cycle generation tables, in sensor order
+        self._names = tuple(self.sensors)
+        self._bases = tuple(s.base_value for s in self.sensors.values())
+        self._vars = tuple(s.variation for s in self.sensors.values())
+        
         self.data_file = 'air_quality_data.csv'
+        self.binary_file = 'air_quality.bin'
+        self.export_file = 'air_quality_export.csv'
+        self.binary_log = binary_log
         self.config = {
             'alerts': {
                 'pm2_5_threshold': 35,
                 'co2_threshold': 1000,
                 'ozone_threshold': 100
             },
-            'logging': {'interval': 10}  # Faster for demo
+            'logging': {'interval': 10, 'flush_rows': 6, 'flush_seconds': 10}  # Faster for demo
         }
         
-        self._init_csv_file()
+        # Log handle, opened on the first row and kept open
+        self._rows_pending = 0
+        self._last_flush = time.monotonic()
+        self._log_fh = None
         self.running = False
         
         logger.info("AIR QUALITY MONITOR DEMO INITIALIZED")
@@ -83,48 +108,32 @@ class AirQualityMonitorDemo:
     
     def _init_csv_file(self):
         """Initialize CSV file with headers"""
-        if not Path(self.data_file).exists():
-            headers = ['timestamp', 'pm2_5', 'pm10', 'co2', 'tvoc', 'ozone', 'temperature', 'humidity']
-            with open(self.data_file, 'w', newline='') as f:
+        try:
+            # Exclusive create: atomic, no separate exists() check
+            with open(self.data_file, 'x', newline='') as f:
                 writer = csv.writer(f)
-                writer.writerow(headers)
+                writer.writerow(self._CSV_KEYS)
+        except FileExistsError:
+            pass
     
     def read_all_sensors(self):
         """Read all sensor data"""
-        data = {'timestamp': datetime.now().isoformat()}
+        data = {'timestamp_ns': time.time_ns()}
         
-        for sensor_name, sensor in self.sensors.items():
-            reading = sensor.read()
-            data[sensor_name] = reading['value']
+        # base_value +/- variation, non-negative, for every sensor in one pass
+        uniform = random.uniform
+        data.update(zip(self._names, [
+            round(max(0, base + uniform(-var, var)), 1)
+            for base, var in zip(self._bases, self._vars)
+        ]))
         
         return data
     
     def calculate_aqi(self, pm2_5_value):
         """Calculate Air Quality Index from PM2.5"""
-        if pm2_5_value <= 12:
-            aqi = int(pm2_5_value * 50 / 12)
-            category = "Good"
-            color = "🟢"
-        elif pm2_5_value <= 35.4:
-            aqi = int(50 + (pm2_5_value - 12) * 50 / 23.4)
-            category = "Moderate"
-            color = "🟡"
-        elif pm2_5_value <= 55.4:
-            aqi = int(100 + (pm2_5_value - 35.4) * 50 / 20)
-            category = "Unhealthy for Sensitive"
-            color = "🟠"
-        elif pm2_5_value <= 150.4:
-            aqi = int(150 + (pm2_5_value - 55.4) * 50 / 95)
-            category = "Unhealthy"
-            color = "🔴"
-        elif pm2_5_value <= 250.4:
-            aqi = int(200 + (pm2_5_value - 150.4) * 100 / 100)
-            category = "Very Unhealthy"
-            color = "🟣"
-        else:
-            aqi = int(300 + (pm2_5_value - 250.4) * 100 / 99.6)
-            category = "Hazardous"
-            color = "🟤"
+        i = bisect_left(self._AQI_PM_UPPER, pm2_5_value)
+        pm_low, aqi_low, aqi_span, pm_span, category, color = self._AQI_BANDS[i]
+        aqi = int(aqi_low + (pm2_5_value - pm_low) * aqi_span / pm_span)
         
         return {'aqi': aqi, 'category': category, 'color': color}
     
@@ -146,25 +155,71 @@ class AirQualityMonitorDemo:
         
         return alerts
     
+    def _timestamp_str(self, data):
+        """Format the cycle timestamp on first use and keep it in data"""
+        timestamp = data.get('timestamp')
+        if timestamp is None:
+            timestamp = _format_timestamp_ns(data['timestamp_ns'])
+            data['timestamp'] = timestamp
+        return timestamp
+    
+    def _open_log(self):
+        """Open the log for appending, flushed in batches instead of reopened per row"""
+        if self.binary_log:
+            self._log_fh = open(self.binary_file, 'ab', buffering=1 << 16)
+        else:
+            self._init_csv_file()
+            self._log_fh = open(self.data_file, 'a', newline='', buffering=1 << 16)
+            self._csv_writer = csv.writer(self._log_fh)
+    
     def log_data(self, data):
-        """Log data to CSV file"""
+        """Log data to CSV file (or the binary log)"""
         try:
-            with open(self.data_file, 'a', newline='') as f:
-                writer = csv.writer(f)
-                row = [
-                    data['timestamp'],
-                    data['pm2_5'],
-                    data['pm10'],
-                    data['co2'],
-                    data['tvoc'],
-                    data['ozone'],
-                    data['temperature'],
-                    data['humidity']
-                ]
-                writer.writerow(row)
+            if self._log_fh is None:
+                self._open_log()
+            if self.binary_log:
+                self._log_fh.write(_BIN_RECORD.pack(data['timestamp_ns'],
+                                                    *self._VALUE_GET(data)))
+            else:
+                self._timestamp_str(data)
+                self._csv_writer.writerow(self._CSV_GET(data))
+            
+            self._rows_pending += 1
+            now = time.monotonic()
+            if (self._rows_pending >= self.config['logging']['flush_rows']
+                    or now - self._last_flush >= self.config['logging']['flush_seconds']):
+                self._log_fh.flush()
+                self._rows_pending = 0
+                self._last_flush = now
         except Exception as e:
             logger.error(f"Error logging data: {e}")
     
+    def to_csv(self, csv_file=None):
+        """Convert the binary log to CSV, returns the number of rows written
+        
+        Writes to export_file by default and never overwrites an existing
+        file (FileExistsError), so the live CSV log can't be clobbered.
+        """
+        csv_file = csv_file or self.export_file
+        if self._log_fh is not None and not self._log_fh.closed and self.binary_log:
+            self._log_fh.flush()
+        
+        with open(self.binary_file, 'rb') as f:
+            raw = f.read()
+        # Ignore a partially written trailing record
+        raw = raw[:len(raw) - len(raw) % _BIN_RECORD.size]
+        
+        count = 0
+        with open(csv_file, 'x', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self._CSV_KEYS)
+            for ts_ns, *values in _BIN_RECORD.iter_unpack(raw):
+                timestamp = _format_timestamp_ns(ts_ns)
+                writer.writerow([timestamp] + [round(v, 1) for v in values])
+                count += 1
+        
+        return count
+    
     def display_data(self, data, aqi_info, alerts):
         """Display data on console"""
         print("\n" + "=" * 60)
@@ -192,7 +247,7 @@ class AirQualityMonitorDemo:
             print(f"\n✅ All readings within normal ranges")
         
         print("=" * 60)
-        print("📝 Data logged to:", self.data_file)
+        print("📝 Data logged to:", self.binary_file if self.binary_log else self.data_file)
         print("🌐 Web dashboard: Run 'python web_dashboard.py' then visit http://localhost:5000")
         print("⏹️  Press Ctrl+C to stop monitoring")
     
@@ -208,9 +263,12 @@ class AirQualityMonitorDemo:
         print("🌬️ " * 20)
         
         try:
+            interval = self.config['logging']['interval']
+            next_tick = time.monotonic()
             cycle_count = 0
             while self.running:
                 cycle_count += 1
+                next_tick += interval
                 
                 # Read all sensors
                 data = self.read_all_sensors()
@@ -228,10 +286,16 @@ class AirQualityMonitorDemo:
                 self.display_data(data, aqi_info, alerts)
                 
                 # Show progress
-                print(f"\n📈 Reading #{cycle_count} - Next update in {self.config['logging']['interval']} seconds...")
+                print(f"\n📈 Reading #{cycle_count} - Next update in {interval} seconds...")
                 
-                # Wait for next reading
-                time.sleep(self.config['logging']['interval'])
+                # Wait for next reading, measured from the previous tick so
+                # processing time doesn't accumulate as drift
+                remaining = next_tick - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    logger.warning(f"Monitoring loop overran by {-remaining:.2f}s")
+                    next_tick = time.monotonic()
                 
         except KeyboardInterrupt:
             print("\n\n🛑 Monitoring stopped by user")
@@ -245,8 +309,10 @@ class AirQualityMonitorDemo:
     def cleanup(self):
         """Clean up resources"""
         self.running = False
+        if self._log_fh is not None and not self._log_fh.closed:
+            self._log_fh.close()
         print("\n🧹 Cleanup completed")
-        print("📊 Check your data in:", self.data_file)
+        print("📊 Check your data in:", self.binary_file if self.binary_log else self.data_file)
         logger.info("Demo cleanup completed")
 
 
@@ -262,5 +328,19 @@ if __name__ == "__main__":
     print("• DHT22 (Temperature/Humidity)")
     print("=" * 50)
     
-    monitor = AirQualityMonitorDemo()
+    if '--export-csv' in sys.argv:
+        # Convert an existing binary log and exit
+        demo = AirQualityMonitorDemo(binary_log=True)
+        try:
+            rows = demo.to_csv()
+        except FileNotFoundError:
+            print(f"❌ Error: {demo.binary_file} not found!")
+            sys.exit(1)
+        except FileExistsError:
+            print(f"❌ Error: {demo.export_file} already exists, move it away first")
+            sys.exit(1)
+        print(f"📄 Exported {rows} readings to {demo.export_file}")
+        sys.exit(0)
+    
+    monitor = AirQualityMonitorDemo(binary_log='--binary' in sys.argv)
     monitor.run_monitoring_loop()
\ No newline at end of file
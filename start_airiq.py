@@ -8,25 +8,32 @@ import os
 import sys
 import subprocess
 import platform
+from functools import cache
+from pathlib import Path
 
+@cache
 def detect_raspberry_pi():
     """Detect if running on Raspberry Pi"""
     try:
-        with open('/proc/cpuinfo', 'r') as f:
-            return 'Raspberry Pi' in f.read()
+        return Path('/proc/cpuinfo').read_bytes().find(b'Raspberry Pi') != -1
     except FileNotFoundError:
         return False
 
+# Evaluated once at import
+IS_RASPBERRY_PI = detect_raspberry_pi()
+SYSTEM = platform.system()
+PYTHON = sys.executable
+
 def main():
     """Main startup function"""
     print("🔍 AirIQ Smart Launcher")
     print("=" * 30)
     
     # Detect platform
-    is_raspberry_pi = detect_raspberry_pi()
-    is_windows = platform.system() == 'Windows'
+    is_raspberry_pi = IS_RASPBERRY_PI
+    is_windows = SYSTEM == 'Windows'
     
-    print(f"Platform: {platform.system()}")
+    print(f"Platform: {SYSTEM}")
     print(f"Raspberry Pi: {'Yes' if is_raspberry_pi else 'No'}")
     
     # Choose appropriate script
@@ -38,14 +45,18 @@ def main():
         print("\n🎮 Running AirIQ Demo (Simulation mode)")
     
     # Check if script exists
-    if not os.path.exists(script):
+    if not Path(script).is_file():
         print(f"❌ Error: {script} not found!")
         return 1
     
     try:
         # Launch the appropriate script
-        print(f"🚀 Launching {script}...")
-        subprocess.run([sys.executable, script])
+        print(f"🚀 Launching {script}...", flush=True)
+        if is_windows:
+            subprocess.run([PYTHON, script])
+        else:
+            # Replace the launcher process instead of keeping it as a parent
+            os.execv(PYTHON, [PYTHON, script])
     except KeyboardInterrupt:
         print("\n👋 AirIQ Launcher stopped")
     except Exception as e:
@@ -4,17 +4,167 @@ Ultra-Simple Web Dashboard for Air Quality Monitor
 No external dependencies except Flask
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
+import os
+import time
+import threading
 import json
 import csv
+import gzip
 from datetime import datetime, timedelta
 from pathlib import Path
+from array import array
+from collections import deque
+from bisect import bisect_left
+from operator import add
+from functools import lru_cache, wraps
 
 app = Flask(__name__)
 
+# EPA PM2.5 breakpoints: (pm_low, aqi_low, aqi_span, pm_span, category, color)
+_AQI_BANDS = (
+    (0, 0, 50, 12, 'Good', '#00e400'),
+    (12, 50, 50, 23.4, 'Moderate', '#ffff00'),
+    (35.4, 100, 50, 20, 'Unhealthy for Sensitive', '#ff7e00'),
+    (55.4, 150, 50, 95, 'Unhealthy', '#ff0000'),
+    (150.4, 200, 100, 100, 'Very Unhealthy', '#8f3f97'),
+    (250.4, 300, 100, 99.6, 'Hazardous', '#7e0023'),
+)
+# Inclusive upper PM2.5 bound of every band but the last
+_AQI_PM_UPPER = (12, 35.4, 55.4, 150.4, 250.4)
+
 class UltraSimpleWebDashboard:
+    TAIL_BYTES = 8192     # enough for the last row of any realistic log
+    RING_SIZE = 8640      # rows kept in memory, a day at the 10 s log interval
+    RING_HOURS = 24       # history loaded into the ring when (re)opening the file
+    VALUE_SCALE = 100     # ring values are fixed-point hundredths
+    RECENT_POINTS = 50    # time buckets /api/recent averages into
+    SNAPSHOT_HOURS = 6    # /api/recent window precomputed by the follower thread
+    MAX_HOURS = 24 * 366 * 10  # longest /api/recent window, ten years
+    POLL_INTERVAL = 1.0   # seconds between checks for appended rows
+    
     def __init__(self, data_file='air_quality_data.csv'):
         self.data_file = data_file
+        
+        # Header is read once and refreshed only if the file is replaced
+        self._header = None
+        self._header_inode = None
+        self._header_size = 0
+        
+        # Newline count, advanced over appended bytes only. It has its own
+        # lock so a long count doesn't hold up /api/current and /api/recent
+        self._count_lock = threading.Lock()
+        self._line_count = 0
+        self._count_inode = None
+        self._count_offset = 0
+        
+        # Parsed views shared by all endpoints, keyed on the file state so
+        # each append is parsed once rather than once per endpoint
+        self._lock = threading.Lock()  # Requests may be served concurrently
+        self._tail_cache = lru_cache(maxsize=1)(self._load_tail)
+        self._recent_cache = lru_cache(maxsize=8)(self._load_recent_data)
+        
+        # Newest parsed rows as (datetime, array('i') of scaled values),
+        # fed by start_watching
+        self._ring = deque(maxlen=self.RING_SIZE)
+        self._ring_header = None
+        self._ring_inode = None
+        self._ring_offset = 0
+        self._watching = False
+        
+        # Endpoint results recomputed by the follower thread; replaced as a
+        # whole, never modified, so readers need no lock
+        self._snapshot = {}
+    
+    def _file_key(self):
+        """(inode, size, mtime_ns) of the CSV, changes on every append"""
+        st = os.stat(self.data_file)
+        return st.st_ino, st.st_size, st.st_mtime_ns
+    
+    def _get_header(self, inode, size):
+        """Return the cached CSV header, re-reading it after log rotation"""
+        if (self._header is None or inode != self._header_inode
+                or size < self._header_size):
+            with open(self.data_file, 'r', newline='') as f:
+                self._header = next(csv.reader(f), [])
+            self._header_inode = inode
+        self._header_size = size
+        return self._header
+    
+    def _read_last_line(self, size):
+        """Return the last non-empty line of the CSV by reading only its tail"""
+        with open(self.data_file, 'rb') as f:
+            start = max(0, size - self.TAIL_BYTES)
+            f.seek(start)
+            tail = f.read().decode('utf-8', 'replace')
+        
+        lines = [line for line in tail.splitlines() if line.strip()]
+        if start == 0 and len(lines) < 2:  # Header + at least one data row
+            return None
+        return lines[-1] if lines else None
+    
+    def _load_tail(self, file_key):
+        """Header and last line for one file state"""
+        inode, size, _ = file_key
+        with self._lock:
+            header = self._get_header(inode, size)
+        return header, self._read_last_line(size)
+    
+    def _count_lines(self, inode, size):
+        """Number of complete lines in the CSV, counting only new bytes"""
+        if inode != self._count_inode or size < self._count_offset:
+            self._line_count = 0
+            self._count_offset = 0
+            self._count_inode = inode
+        
+        with open(self.data_file, 'rb') as f:
+            pos = self._count_offset
+            f.seek(pos)
+            while pos < size:
+                chunk = f.read(min(1 << 20, size - pos))
+                if not chunk:
+                    break
+                newlines = chunk.count(b'\n')
+                if newlines:
+                    self._line_count += newlines
+                    # Resume after the last newline, so a half-written
+                    # row at the end is counted once it is complete
+                    self._count_offset = pos + chunk.rfind(b'\n') + 1
+                pos += len(chunk)
+        return self._line_count
+    
+    def get_stats(self):
+        """Row count plus oldest/newest timestamps, read from the file ends"""
+        stats = {
+            'total_readings': 0,
+            'data_available': False,
+            'oldest_reading': None,
+            'newest_reading': None,
+        }
+        try:
+            file_key = self._file_key()
+            inode, size, _ = file_key
+            with self._count_lock:
+                total = max(0, self._count_lines(inode, size) - 1)  # Minus the header
+            if total == 0:
+                return stats
+            
+            with open(self.data_file, 'rb') as f:
+                f.readline()  # Header
+                oldest_line = f.readline().decode('utf-8', 'replace')
+            _, newest_line = self._tail_cache(file_key)
+            
+            stats['total_readings'] = total
+            stats['data_available'] = True
+            stats['oldest_reading'] = next(csv.reader([oldest_line]), [None])[0]
+            if newest_line:
+                stats['newest_reading'] = next(csv.reader([newest_line]), [None])[0]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error reading stats: {e}")
+        
+        return stats
     
     def get_current_readings(self):
         """Get the most recent sensor readings from CSV"""
@@ -32,111 +182,382 @@ class UltraSimpleWebDashboard:
                     'humidity': 55.0
                 }
             
-            # Read the last line of CSV file
-            with open(self.data_file, 'r') as f:
-                lines = f.readlines()
-                if len(lines) < 2:  # Header + at least one data row
-                    return {}
-                
-                # Get header and last data row
-                header = lines[0].strip().split(',')
-                last_row = lines[-1].strip().split(',')
-                
-                # Create dictionary from header and data
-                readings = {}
-                for i, col in enumerate(header):
-                    if i < len(last_row):
-                        if col == 'timestamp':
-                            # Parse and reformat timestamp
-                            try:
-                                dt = datetime.fromisoformat(last_row[i].replace('Z', '+00:00'))
-                                readings[col] = dt.strftime('%Y-%m-%d %H:%M:%S')
-                            except:
-                                readings[col] = last_row[i]
-                        else:
-                            try:
-                                readings[col] = float(last_row[i])
-                            except:
-                                readings[col] = last_row[i]
-                
-                return readings
+            # Read only the tail of the CSV file
+            header, last_line = self._tail_cache(self._file_key())
+            if last_line is None:
+                return {}
+            last_row = next(csv.reader([last_line]))
+            
+            # Create dictionary from header and data
+            readings = {}
+            for col, value in zip(header, last_row):
+                if col == 'timestamp':
+                    # Parse and reformat timestamp
+                    try:
+                        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+                        readings[col] = dt.strftime('%Y-%m-%d %H:%M:%S')
+                    except:
+                        readings[col] = value
+                else:
+                    try:
+                        readings[col] = float(value)
+                    except:
+                        readings[col] = value
+            
+            return readings
                 
         except Exception as e:
             print(f"Error reading CSV: {e}")
             return {}
     
+    @staticmethod
+    def _line_time(raw_line):
+        """Timestamp of a raw CSV line, None if it can't be parsed"""
+        try:
+            timestamp_str = raw_line.split(b',', 1)[0].decode('ascii')
+            return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        except (ValueError, UnicodeDecodeError):
+            return None
+    
+    def _seek_to_time(self, f, cutoff_time):
+        """Position f at a line boundary before the first row >= cutoff_time
+        
+        Rows are appended in time order, so a binary search over byte
+        offsets finds the window without parsing older rows. Only the
+        last TAIL_BYTES-sized stretch is scanned linearly by the caller.
+        """
+        lo = f.tell()
+        hi = os.fstat(f.fileno()).st_size
+        start = lo
+        
+        while hi - lo > self.TAIL_BYTES:
+            mid = (lo + hi) // 2
+            f.seek(mid)
+            f.readline()  # Finish the partial line
+            dt = self._line_time(f.readline())
+            try:
+                older = dt is not None and dt < cutoff_time
+            except TypeError:  # Timezone-aware vs naive timestamps
+                older = False
+            if older:
+                lo = mid
+            else:
+                hi = mid
+        
+        f.seek(lo)
+        if lo != start:
+            f.readline()  # Land on the next line boundary
+    
+    def start_watching(self):
+        """Follow the CSV from a background thread, parsing only appended bytes"""
+        if self._watching:
+            return
+        self._watching = True
+        self._poll_ring()
+        self._refresh_snapshot()
+        threading.Thread(target=self._watch_loop, name='csv-follow', daemon=True).start()
+    
+    def _watch_loop(self):
+        """Poll the CSV for new rows until the process exits"""
+        while True:
+            time.sleep(self.POLL_INTERVAL)
+            try:
+                self._poll_ring()
+                self._refresh_snapshot()
+            except Exception as e:
+                print(f"Error following CSV: {e}")
+    
+    def _refresh_snapshot(self):
+        """Recompute the endpoint results when the CSV changes, and each minute as windows slide"""
+        try:
+            file_key = self._file_key()
+        except FileNotFoundError:
+            self._snapshot = {}  # Demo readings are made per request
+            return
+        
+        minute = int(time.time() // 60)
+        snapshot = self._snapshot
+        if snapshot.get('file_key') == file_key and snapshot.get('minute') == minute:
+            return
+        
+        # Built completely before it is published
+        self._snapshot = {
+            'file_key': file_key,
+            'minute': minute,
+            'current': self.get_current_readings(),
+            'stats': self.get_stats(),
+            'recent': self.get_recent_data(self.SNAPSHOT_HOURS),
+        }
+    
+    def get_snapshot(self, name):
+        """Result precomputed by the follower thread, None if the CSV changed since"""
+        snapshot = self._snapshot
+        try:
+            if snapshot.get('file_key') == self._file_key():
+                return snapshot.get(name)
+        except FileNotFoundError:
+            pass
+        return None
+    
+    def _poll_ring(self):
+        """Move rows written since the last poll into the ring"""
+        try:
+            st = os.stat(self.data_file)
+        except FileNotFoundError:
+            with self._lock:
+                self._ring.clear()
+                self._ring_inode = None
+            return
+        
+        reset = st.st_ino != self._ring_inode or st.st_size < self._ring_offset
+        if not reset and st.st_size == self._ring_offset:
+            return
+        
+        with open(self.data_file, 'rb') as f:
+            if reset:
+                # New or rotated file: header, then only the last RING_HOURS
+                header_line = f.readline()
+                if not header_line.endswith(b'\n'):  # No complete header yet
+                    with self._lock:
+                        self._ring.clear()
+                        self._ring_inode = None
+                    return
+                header = next(csv.reader([header_line.decode('utf-8', 'replace')]))
+                self._seek_to_time(f, datetime.now() - timedelta(hours=self.RING_HOURS))
+            else:
+                header = self._ring_header
+                f.seek(self._ring_offset)
+            offset = f.tell()
+            chunk = f.read(st.st_size - offset)
+        
+        # Leave a half-written last row for the next poll
+        end = chunk.rfind(b'\n') + 1
+        rows = self._parse_rows(header, chunk[:end])
+        
+        with self._lock:
+            if reset:
+                self._ring.clear()
+                self._ring_header = header
+                self._ring_inode = st.st_ino
+            self._ring.extend(rows)
+            self._ring_offset = offset + end
+    
+    @classmethod
+    def _parse_rows(cls, header, chunk):
+        """Parse complete CSV lines into (datetime, scaled values) pairs"""
+        rows = []
+        lines = chunk.decode('utf-8', 'replace').splitlines()
+        for row in csv.reader(lines):
+            if len(row) < len(header):
+                continue
+            try:
+                dt = datetime.fromisoformat(row[0].replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            if dt.tzinfo is not None:  # Not comparable with the local cutoff
+                continue
+            rows.append((dt, cls._quantize(header, row)))
+        return rows
+    
+    @classmethod
+    def _quantize(cls, header, row):
+        """Value fields as fixed-point hundredths in an int32 array
+        
+        About a fifth of the memory of a dict of floats per row. Readings
+        are logged with one or two decimals and averages are rounded to
+        two, so nothing visible is lost.
+        """
+        values = row[1:len(header)]  # Skip timestamp column
+        try:
+            return array('i', [round(float(value) * cls.VALUE_SCALE) for value in values])
+        except (ValueError, OverflowError):
+            # Fall back to field by field only for rows with a bad value
+            fixed = array('i')
+            for value in values:
+                try:
+                    fixed.append(round(float(value) * cls.VALUE_SCALE))
+                except (ValueError, OverflowError):
+                    fixed.append(0)
+            return fixed
+    
+    def _downsample(self, header, rows, hours):
+        """Average (datetime, scaled values) pairs into time buckets, as {column: [values]}
+        
+        Buckets are hours / RECENT_POINTS wide and aligned to the epoch, so
+        the same rows land in the same buckets on every call. Empty buckets
+        are left out; each one is labelled with its start time.
+        """
+        width = max(hours * 3600 / self.RECENT_POINTS, 1)
+        sums = {}
+        counts = {}
+        for dt, fixed in rows:
+            start = dt.timestamp() // width * width
+            total = sums.get(start)
+            if total is None:
+                sums[start] = list(fixed)
+                counts[start] = 1
+            else:
+                sums[start] = list(map(add, total, fixed))
+                counts[start] += 1
+        if not sums:
+            return {}
+        
+        # Rows are in time order, so the buckets are too
+        columns = {'timestamp': [datetime.fromtimestamp(start).isoformat(timespec='seconds')
+                                 for start in sums]}
+        means = zip(*([round(value / (counts[start] * self.VALUE_SCALE), 2) for value in total]
+                      for start, total in sums.items()))
+        columns.update(zip(header[1:], map(list, means)))
+        return columns
+    
     def get_recent_data(self, hours=24):
-        """Get recent data points for simple charting"""
+        """Get recent data for simple charting as {column: [values]}
+        
+        The window is averaged into about RECENT_POINTS time buckets. While
+        start_watching is active it is served from the in-memory ring if
+        that reaches back past the cutoff, otherwise it is parsed from the
+        file. Either way the lists are shared between callers and must not
+        be modified.
+        """
+        try:
+            file_key = self._file_key()
+        except FileNotFoundError:
+            return {}
+        
+        if self._watching:
+            cutoff_time = datetime.now() - timedelta(hours=hours)
+            inode, size, _ = file_key
+            with self._lock:
+                # Only once the follower has caught up with the file
+                caught_up = (inode, size) == (self._ring_inode, self._ring_offset)
+                ring = list(self._ring) if caught_up else None
+                header = self._ring_header
+            # The ring holds the newest rows, so it covers the whole window
+            # once its oldest row is older than the cutoff
+            if ring and ring[0][0] < cutoff_time:
+                return self._downsample(header, [(dt, fixed) for dt, fixed in ring
+                                                 if dt >= cutoff_time], hours)
+        
+        return self._recent_cache(hours, file_key, int(time.time() // 60))
+    
+    def _load_recent_data(self, hours, file_key, minute):
+        """Parse and down-sample the recent window for one file state"""
         try:
-            if not Path(self.data_file).exists():
-                return []
-            
             cutoff_time = datetime.now() - timedelta(hours=hours)
-            recent_data = []
             
-            with open(self.data_file, 'r') as f:
-                lines = f.readlines()
-                if len(lines) < 2:
-                    return []
-                
-                header = lines[0].strip().split(',')
+            with open(self.data_file, 'rb') as f:
+                header = next(csv.reader([f.readline().decode('utf-8', 'replace')]))
                 
-                for line in lines[1:]:  # Skip header
-                    row = line.strip().split(',')
-                    if len(row) >= len(header):
-                        try:
-                            # Parse timestamp
-                            timestamp_str = row[0]
-                            dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                            
-                            if dt >= cutoff_time:
-                                data_point = {'timestamp': timestamp_str}
-                                for i, col in enumerate(header[1:], 1):  # Skip timestamp column
-                                    if i < len(row):
-                                        try:
-                                            data_point[col] = float(row[i])
-                                        except:
-                                            data_point[col] = 0
-                                recent_data.append(data_point)
-                        except:
-                            continue
-                            
-            return recent_data[-50:]  # Return last 50 points max
+                # Skip the part of the log that is older than the cutoff
+                self._seek_to_time(f, cutoff_time)
+                chunk = f.read()
+            
+            rows = self._parse_rows(header, chunk)
+            return self._downsample(header, [(dt, fixed) for dt, fixed in rows
+                                             if dt >= cutoff_time], hours)
             
         except Exception as e:
             print(f"Error getting recent data: {e}")
-            return []
+            return {}
     
     def get_air_quality_index(self, pm2_5_value):
-        """Calculate AQI based on PM2.5"""
+        """Calculate AQI based on PM2.5 (a value, or a list/tuple of values)"""
+        if isinstance(pm2_5_value, (list, tuple)):
+            return [self.get_air_quality_index(value) for value in pm2_5_value]
+        
         if pm2_5_value is None or pm2_5_value == 0:
-            return {'aqi': 0, 'category': 'Unknown', 'color': '#gray'}
-        
-        if pm2_5_value <= 12:
-            return {'aqi': int(pm2_5_value * 50 / 12), 'category': 'Good', 'color': '#00e400'}
-        elif pm2_5_value <= 35.4:
-            return {'aqi': int(50 + (pm2_5_value - 12) * 50 / 23.4), 'category': 'Moderate', 'color': '#ffff00'}
-        elif pm2_5_value <= 55.4:
-            return {'aqi': int(100 + (pm2_5_value - 35.4) * 50 / 20), 'category': 'Unhealthy for Sensitive', 'color': '#ff7e00'}
-        elif pm2_5_value <= 150.4:
-            return {'aqi': int(150 + (pm2_5_value - 55.4) * 50 / 95), 'category': 'Unhealthy', 'color': '#ff0000'}
-        elif pm2_5_value <= 250.4:
-            return {'aqi': int(200 + (pm2_5_value - 150.4) * 100 / 100), 'category': 'Very Unhealthy', 'color': '#8f3f97'}
-        else:
-            return {'aqi': int(300 + (pm2_5_value - 250.4) * 100 / 99.6), 'category': 'Hazardous', 'color': '#7e0023'}
+            return {'aqi': 0, 'category': 'Unknown', 'color': '#808080'}
+        
+        # Piecewise-linear interpolation inside the band holding the value
+        i = bisect_left(_AQI_PM_UPPER, pm2_5_value)
+        pm_low, aqi_low, aqi_span, pm_span, category, color = _AQI_BANDS[i]
+        return {'aqi': int(aqi_low + (pm2_5_value - pm_low) * aqi_span / pm_span),
+                'category': category, 'color': color}
 
 # Create dashboard instance
 dashboard = UltraSimpleWebDashboard()
+dashboard.start_watching()
+
+# Rendered API responses keyed on request path + CSV mtime
+_response_cache = {}
+_RESPONSE_CACHE_MAX = 64
+_GZIP_MIN_BYTES = 500  # smaller bodies don't shrink enough to be worth it
+
+def _data_mtime_ns():
+    """Modification time of the CSV, 0 if it doesn't exist yet"""
+    try:
+        return os.stat(dashboard.data_file).st_mtime_ns
+    except OSError:
+        return 0
+
+def cached_by_mtime(timeout=5, per_minute=False):
+    """Serve repeated requests from memory until the CSV changes or timeout expires
+    
+    Responses are validated by the CSV mtime (ETag/Last-Modified), and
+    larger bodies are sent gzipped to clients that accept it. Views whose
+    result also depends on the clock (a time window) pass per_minute so
+    their ETag changes each minute even while the CSV doesn't.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            mtime_ns = _data_mtime_ns()
+            minute = int(time.time() // 60) if per_minute else 0
+            etag = None  # None for demo data
+            if mtime_ns:
+                etag = 'W/"%x-%x"' % (mtime_ns, minute) if per_minute else 'W/"%x"' % mtime_ns
+            if etag and etag in request.headers.get('If-None-Match', ''):
+                return Response(status=304, headers={'ETag': etag})
+            
+            key = (request.full_path, mtime_ns, minute)
+            now = time.monotonic()
+            hit = _response_cache.get(key)
+            if not hit or hit[0] <= now:
+                fresh = view(*args, **kwargs)
+                data = fresh.get_data()
+                # Compressed once per cache entry, at a fast level
+                compressed = (gzip.compress(data, compresslevel=3)
+                              if len(data) >= _GZIP_MIN_BYTES else None)
+                hit = (now + timeout, data, compressed, fresh.mimetype)
+                if len(_response_cache) >= _RESPONSE_CACHE_MAX:
+                    _response_cache.clear()
+                _response_cache[key] = hit
+            
+            _, data, compressed, mimetype = hit
+            response = app.response_class(data, mimetype=mimetype)
+            if compressed is not None:
+                response.vary.add('Accept-Encoding')
+                if request.accept_encodings['gzip'] > 0:  # Not for gzip;q=0
+                    response.set_data(compressed)
+                    response.content_encoding = 'gzip'
+            if etag:
+                response.headers['ETag'] = etag
+                response.last_modified = mtime_ns // 1_000_000_000
+            return response
+        return wrapper
+    return decorator
+
+# The page is static (data comes from /api/*), so render it once
+_INDEX_TEMPLATE = 'ultra_simple_dashboard.html'
+with app.app_context():
+    _INDEX_HTML = render_template(_INDEX_TEMPLATE).encode('utf-8')
+_INDEX_ETAG = '"%x"' % os.stat(
+    os.path.join(app.root_path, app.template_folder, _INDEX_TEMPLATE)).st_mtime_ns
 
 @app.route('/')
 def index():
     """Main dashboard page"""
-    return render_template('ultra_simple_dashboard.html')
+    if _INDEX_ETAG in request.headers.get('If-None-Match', ''):
+        return Response(status=304, headers={'ETag': _INDEX_ETAG})
+    return Response(_INDEX_HTML, mimetype='text/html', headers={'ETag': _INDEX_ETAG})
 
 @app.route('/api/current')
+@cached_by_mtime()
 def api_current():
     """API endpoint for current readings"""
-    readings = dashboard.get_current_readings()
+    readings = dashboard.get_snapshot('current')
+    if readings is None:
+        readings = dashboard.get_current_readings()
     
     # Calculate AQI if PM2.5 is available
     pm2_5_value = readings.get('pm2_5', 0)
@@ -149,39 +570,42 @@ def api_current():
     })
 
 @app.route('/api/recent/<parameter>')
+@cached_by_mtime(per_minute=True)
 def api_recent(parameter):
     """API endpoint for recent data points"""
     hours = request.args.get('hours', 6, type=int)
-    recent_data = dashboard.get_recent_data(hours)
-    
-    # Extract specific parameter
-    timestamps = []
-    values = []
+    # Out-of-range windows would overflow the cutoff datetime
+    hours = min(max(hours, 1), dashboard.MAX_HOURS)
+    columns = None
+    if hours == dashboard.SNAPSHOT_HOURS:
+        columns = dashboard.get_snapshot('recent')
+    if columns is None:
+        columns = dashboard.get_recent_data(hours)
     
-    for data_point in recent_data:
-        if parameter in data_point:
-            timestamps.append(data_point['timestamp'])
-            values.append(data_point[parameter])
+    # Extract specific parameter, a lookup into the column lists
+    values = columns.get(parameter)
+    if values is not None:
+        timestamps = columns['timestamp']
+    else:
+        timestamps = []
+        values = []
     
-    return jsonify({
+    # Compact encoding, no indentation or key sorting
+    body = json.dumps({
         'parameter': parameter,
         'timestamps': timestamps,
         'values': values,
         'count': len(values)
-    })
+    }, separators=(',', ':'))
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/stats')
+@cached_by_mtime()
 def api_stats():
     """API endpoint for basic statistics"""
-    recent_data = dashboard.get_recent_data(24)  # Last 24 hours
-    
-    stats = {
-        'total_readings': len(recent_data),
-        'data_available': len(recent_data) > 0,
-        'oldest_reading': recent_data[0]['timestamp'] if recent_data else None,
-        'newest_reading': recent_data[-1]['timestamp'] if recent_data else None,
-    }
-    
+    stats = dashboard.get_snapshot('stats')
+    if stats is None:
+        stats = dashboard.get_stats()
     return jsonify(stats)
 
 if __name__ == '__main__':
@@ -191,7 +615,13 @@ if __name__ == '__main__':
     print("⏹️  Press Ctrl+C to stop")
     
     try:
-        app.run(host='0.0.0.0', port=5000, debug=False)
+        try:
+            # Multi-threaded production server when available
+            from waitress import serve
+            print("🚦 Serving with waitress (8 threads)")
+            serve(app, host='0.0.0.0', port=5000, threads=8)
+        except ImportError:
+            app.run(host='0.0.0.0', port=5000, debug=False)
     except KeyboardInterrupt:
         print("\n🛑 Web dashboard stopped by user")
     except Exception as e: